@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+from typing import List, Dict
+
+from dotenv import load_dotenv
+from main import CatalogAggregator, positive_int
+from modules.leaf_extractor import UNSPSCLeafExtractor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+
+class DiscardCollection:
+    """
+    Stands in for the MongoDB collection so benchmark runs do not write catalog documents.
+    """
+
+    def insert_one(self, document):
+        return None
+
+
+async def benchmark(aggregator: CatalogAggregator, categories: List[str]) -> List[Dict[str, float]]:
+    """
+    Runs each category through the aggregator and records its tracemalloc peak.
+    Args:
+        aggregator (CatalogAggregator): Configured aggregator (standard or memory-bounded).
+        categories (List[str]): Category names to process.
+    Returns:
+        List[Dict[str, float]]: Peak traced memory (MiB) and wall time (s) per category.
+    """
+    report = []
+    for category in categories:
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            await aggregator.process_category(category)
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        report.append({
+            "category": category,
+            "peak_mib": peak / (1024 * 1024),
+            "seconds": time.perf_counter() - start
+        })
+        logger.info(f"{category}: peak {peak / (1024 * 1024):.2f} MiB")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory per category (tracemalloc)")
+    parser.add_argument("--code", help="Root UNSPSC code (e.g., 22000000)", default="22000000")
+    parser.add_argument("--categories", nargs="+", help="Explicit categories; skips the UNSPSC lookup")
+    parser.add_argument("--limit", type=int, help="Maximum number of categories to benchmark", default=5)
+    parser.add_argument("--memory-bounded", action="store_true", help="Benchmark the memory-bounded mode", default=False)
+    parser.add_argument("--max-memory-mb", type=positive_int, help="Per-run memory ceiling in memory-bounded mode", default=256)
+    parser.add_argument("--page-reserve-mb", type=positive_int, help="Memory reserved per page while it renders in memory-bounded mode", default=8)
+    parser.add_argument("--store", action="store_true", help="Write the derived catalogs to MongoDB", default=False)
+    args = parser.parse_args()
+
+    categories = args.categories
+    if not categories:
+        leaf_nodes = UNSPSCLeafExtractor().get_leaf_nodes(args.code)
+        categories = [node["category"] for node in leaf_nodes]
+    categories = categories[:args.limit]
+
+    aggregator = CatalogAggregator(
+        memory_bounded=args.memory_bounded,
+        max_memory_mb=args.max_memory_mb,
+        page_reserve_mb=args.page_reserve_mb
+    )
+    if not args.store:
+        aggregator.schema_deriver.collection = DiscardCollection()
+    report = asyncio.run(benchmark(aggregator, categories))
+
+    mode = "memory-bounded" if args.memory_bounded else "standard"
+    print(f"\nPeak traced memory per category ({mode} mode)")
+    print("Python allocations only (tracemalloc); Chromium runs in a separate process and is not included.")
+    print(f"{'category':<50} {'peak MiB':>10} {'seconds':>10}")
+    for row in report:
+        print(f"{row['category'][:50]:<50} {row['peak_mib']:>10.2f} {row['seconds']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
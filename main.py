@@ -20,15 +20,28 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 class CatalogAggregator:
-    def __init__(self, use_agentic: bool = False):
+    def __init__(
+        self,
+        use_agentic: bool = False,
+        memory_bounded: bool = False,
+        max_memory_mb: int = 256,
+        page_reserve_mb: int = 8
+    ):
         self.use_agentic = use_agentic
+        self.memory_bounded = memory_bounded
         self.schema_deriver = CatalogSchemaDeriver()
         if self.use_agentic:
             logger.info("Using AGENTIC catalog search.")
+            if memory_bounded:
+                logger.warning("Memory-bounded mode is not supported by the agentic search; ignoring it.")
             self.catalog_search = CatalogSearchAgent()
         else:
             logger.info("Using catalog search.")
-            self.catalog_search = CatalogPipeline()
+            self.catalog_search = CatalogPipeline(
+                memory_bounded=memory_bounded,
+                max_memory_bytes=max_memory_mb * 1024 * 1024,
+                page_reserve_bytes=page_reserve_mb * 1024 * 1024
+            )
 
     def process_category_agentic(self, category: str):
         logger.info(f"Processing category: {category}")
@@ -45,8 +58,10 @@ class CatalogAggregator:
         try:
             results = await self.catalog_search.run_pipeline(category)
 
-            if results:
-                self.schema_deriver.derive_and_store(category, results)
+            if results and isinstance(results, list) and self.memory_bounded:
+                return self.schema_deriver.derive_and_store_compact(category, results)
+            elif results:
+                return self.schema_deriver.derive_and_store(category, results)
         except Exception as e:
             logger.error(f"Failed to process '{category}': {e}")
 
@@ -72,13 +87,29 @@ class CatalogAggregator:
             self.process_category_agentic(node["category"])
             time.sleep(5)
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description="UNSPSC Catalog Aggregator")
     parser.add_argument("--agentic", action="store_true", help="Use LangChain Agent-based search", default=False)
     parser.add_argument("--code", help="Root UNSPSC code (e.g., 22000000)", default="22000000")
+    parser.add_argument("--memory-bounded", action="store_true", help="Process pages as bounded chunks and keep compact product records", default=False)
+    parser.add_argument("--max-memory-mb", type=positive_int, help="Per-run memory ceiling in memory-bounded mode", default=256)
+    parser.add_argument("--page-reserve-mb", type=positive_int, help="Memory reserved per page while it renders in memory-bounded mode", default=8)
     args = parser.parse_args()
-
-    aggregator = CatalogAggregator(use_agentic=args.agentic)
+    if args.agentic and args.memory_bounded:
+        parser.error("--memory-bounded is not supported with --agentic")
+
+    aggregator = CatalogAggregator(
+        use_agentic=args.agentic,
+        memory_bounded=args.memory_bounded,
+        max_memory_mb=args.max_memory_mb,
+        page_reserve_mb=args.page_reserve_mb
+    )
     if not args.agentic:
         asyncio.run(aggregator.run(args.code))
     else:
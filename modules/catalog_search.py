@@ -1,9 +1,10 @@
 import os
+import sys
 import json
 import asyncio
 import logging
 import aiohttp
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Union
 
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import JsonOutputParser
@@ -13,6 +14,8 @@ from bs4 import BeautifulSoup, Comment
 
 from utils.token_count import count_tokens
 from utils.prompts import CATALOG_PROMPT
+from utils.memory import MemoryBudget, Reservation
+from utils.records import records_from_suppliers
 
 logging.basicConfig(
     level=logging.INFO,  # You can change to DEBUG for verbose logs
@@ -22,7 +25,32 @@ logger = logging.getLogger(__name__)
 
 
 class CatalogPipeline:
-    def __init__(self):
+    def __init__(
+        self,
+        memory_bounded: bool = False,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        page_reserve_bytes: int = 8 * 1024 * 1024,
+        parse_overhead: int = 10,
+        chunk_chars: int = 2000,
+        max_prompt_chars: int = 15000,
+        check_heap: bool = False
+    ):
+        """
+        Args:
+            memory_bounded (bool): Process page text as bounded chunks and return compact product records.
+            max_memory_bytes (int): Memory ceiling shared by every category of the run in memory-bounded mode.
+            page_reserve_bytes (int): Bytes reserved while a page renders, before its real size is known.
+            parse_overhead (int): Bytes reserved per byte of rendered HTML while it is parsed.
+            chunk_chars (int): Maximum size of a single text chunk.
+            max_prompt_chars (int): Total page text sent to the LLM, split evenly across pages.
+            check_heap (bool): Also hold fetches back while the traced Python heap exceeds the ceiling.
+        """
+        self.memory_bounded = memory_bounded
+        self.page_reserve_bytes = page_reserve_bytes
+        self.parse_overhead = parse_overhead
+        self.chunk_chars = chunk_chars
+        self.max_prompt_chars = max_prompt_chars
+        self.budget = MemoryBudget(max_memory_bytes, check_heap=check_heap)
         self.tavily_api_key = os.getenv("TAVILY_API_KEY")
         self.llm = ChatGroq(
             model_name="llama-3.3-70b-versatile",
@@ -59,42 +87,107 @@ class CatalogPipeline:
                 logger.error(f"[ERROR] Tavily search failed: {e}")
                 return []
 
+    @staticmethod
+    def _clean_soup(content: str) -> BeautifulSoup:
+        """
+        Parses rendered HTML and strips non-content elements.
+        """
+        soup = BeautifulSoup(content, "html.parser")
+
+        # Remove script and style elements
+        for tag in soup(["script", "style"]):
+            tag.decompose()
+
+        # Remove comments
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
+
+        # Optionally remove head, meta, nav, footer etc.
+        for tag in soup(["head", "meta", "nav", "footer", "noscript", "iframe"]):
+            tag.decompose()
+
+        return soup
+
+    async def _render(self, url: str) -> str:
+        """
+        Loads a URL in headless Chromium and returns the raw rendered HTML.
+        """
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await page.goto(url, timeout=15000)
+            await page.wait_for_timeout(3000)
+            content = await page.content()
+            await browser.close()
+            return content
+
     async def fetch_html(self, url: str) -> str:
         """
-        Uses async Playwright to fetch fully rendered HTML from a given URL.
+        Fetches a page and returns its visible text with scripts, styles and navigation removed.
         """
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                await page.goto(url, timeout=15000)
-                await page.wait_for_timeout(3000)
-                content = await page.content()
-                await browser.close()
-                soup = BeautifulSoup(content, "html.parser")
-
-                # Remove script and style elements
-                for tag in soup(["script", "style"]):
-                    tag.decompose()
-
-                # Remove comments
-                for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                    comment.extract()
-
-                # Optionally remove head, meta, nav, footer etc.
-                for tag in soup(["head", "meta", "nav", "footer", "noscript", "iframe"]):
-                    tag.decompose()
-
-                content = soup.get_text(separator=" ", strip=True)
-                return content
+            soup = self._clean_soup(await self._render(url))
+            content = soup.get_text(separator=" ", strip=True)
+            return content
         except Exception as e:
             logger.error(f"[ERROR] Failed to scrape {url}: {e}")
             return ""
 
-    async def run_pipeline(self, category: str) -> Dict[str, Any]:
+    def _iter_chunks(self, soup: BeautifulSoup, max_chars: int) -> Iterator[str]:
+        """
+        Yields the visible text of a parsed page as chunks of at most `chunk_chars`,
+        stopping once `max_chars` have been produced instead of materializing the full text.
+        """
+        parts, size, total = [], 0, 0
+        for text in soup.stripped_strings:
+            text = text[:max_chars - total]
+            while text:
+                if size and size + len(text) + 1 > self.chunk_chars:
+                    yield " ".join(parts)
+                    parts, size = [], 0
+                piece, text = text[:self.chunk_chars], text[self.chunk_chars:]
+                parts.append(piece)
+                size += len(piece) + 1
+                total += len(piece) + 1
+            if total >= max_chars:
+                break
+        if parts:
+            yield " ".join(parts)
+
+    async def _fetch_chunks_bounded(self, url: str, max_chars: int, prompt_chunks: List[str]) -> Reservation:
+        """
+        Renders and parses a page under the memory budget, appending its text chunks to `prompt_chunks`.
+        A fixed reservation covers rendering; it then grows to a size based on the real HTML for
+        parsing, so the HTML stays counted while it waits, and finally shrinks to the kept chunks.
+
+        Returns:
+            Reservation: Pinned reservation for the appended chunks; the caller releases it after the LLM call.
+        """
+        reservation = await self.budget.acquire(self.page_reserve_bytes)
+        kept = 0
+        try:
+            content = await self._render(url)
+            await self.budget.resize(reservation, len(content) * self.parse_overhead)
+            soup = self._clean_soup(content)
+            del content
+            for chunk in self._iter_chunks(soup, max_chars):
+                prompt_chunks.append(chunk)
+                kept += sys.getsizeof(chunk)
+            del soup
+        except Exception as e:
+            logger.error(f"[ERROR] Failed to scrape {url}: {e}")
+        finally:
+            await self.budget.resize(reservation, kept)
+            await self.budget.pin(reservation)
+        return reservation
+
+    async def run_pipeline(self, category: str) -> Union[Dict[str, Any], List[Any]]:
         """
         Full pipeline.
         """
+        if self.memory_bounded:
+            return await self.run_pipeline_bounded(category)
+
         logger.info(f"Searching Tavily for: {category}")
         urls = await self.search_tavily(f"Buy {category} online")
 
@@ -111,6 +204,41 @@ class CatalogPipeline:
             logger.error(f"LLM parsing failed: {e}")
             return {"category": category, "error": str(e)}
 
+    async def run_pipeline_bounded(self, category: str) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Memory-bounded pipeline. Page fetches share the run's memory budget, each page contributes
+        at most its share of `max_prompt_chars` as text chunks, and products come back as compact records.
+        The chunks are joined into a single prompt, so for the LLM this is a truncation of each page;
+        the memory saving comes from never building a page's full text and freeing each parse tree early.
+        """
+        logger.info(f"Searching Tavily for: {category}")
+        urls = await self.search_tavily(f"Buy {category} online")
+
+        logger.info(f"Scraping the top urls (memory-bounded)")
+        per_page_chars = self.max_prompt_chars // max(len(urls), 1)
+        prompt_chunks: List[str] = []
+        reservations = await asyncio.gather(
+            *(self._fetch_chunks_bounded(url, per_page_chars, prompt_chunks) for url in urls)
+        )
+        combined_html = "\n\n".join(prompt_chunks)
+        prompt_chunks.clear()
+
+        logger.info("Sending content to LLM for product extraction")
+        try:
+            result = await self.chain.ainvoke({"category": category, "combined_html": combined_html})
+        except Exception as e:
+            logger.error(f"LLM parsing failed: {e}")
+            return {"category": category, "error": str(e)}
+        finally:
+            del combined_html
+            for reservation in reservations:
+                await self.budget.release(reservation)
+
+        # Anything but a supplier list goes to the caller unchanged, as in the standard pipeline.
+        if not isinstance(result, list):
+            return result
+        return records_from_suppliers(result)
+
 
 if __name__ == "__main__":
     pipeline = CatalogPipeline()
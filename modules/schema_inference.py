@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Optional
 
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
@@ -9,6 +9,7 @@ from langchain_groq import ChatGroq
 from pymongo import MongoClient
 
 from utils.prompts import SCHEMA_INFERENCE_PROMPT
+from utils.records import NormalizedCatalog, records_to_suppliers
 
 logging.basicConfig(
     level=logging.INFO,  # You can change to DEBUG for verbose logs
@@ -74,6 +75,36 @@ class CatalogSchemaDeriver:
             logger.error(f"Error processing category '{category}': {e}")
             return {}
 
+    def derive_and_store_compact(self, category: str, records: Sequence[Any]) -> Optional[NormalizedCatalog]:
+        """
+        Memory-bounded variant of `derive_and_store` for compact supplier records.
+        Only the supplier dictionaries sent to the LLM are materialized. The LLM output is stored
+        in MongoDB as it is, and only its compact `NormalizedCatalog` form is returned.
+
+        Args:
+            category (str): The product category (e.g., "Aerial lifts").
+            records (Sequence[Any]): Compact scraped records from `records_from_suppliers`.
+
+        Returns:
+            Optional[NormalizedCatalog]: Compact normalized catalog, or None on failure.
+        """
+        try:
+            input_data = {
+                "category": category,
+                "products": json.dumps(records_to_suppliers(records, limit=10))  # To avoid token limit
+            }
+
+            result = self.chain.invoke(input_data)
+
+            # Store in MongoDB
+            self.collection.insert_one(result)
+            logger.info(f"Saved '{category}' with {len(result['products'])} products to MongoDB.")
+            return NormalizedCatalog.from_dict(result)
+
+        except Exception as e:
+            logger.error(f"Error processing category '{category}': {e}")
+            return None
+
 if __name__ == "__main__":
     sample = [
         {
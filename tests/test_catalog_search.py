@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+from bs4 import BeautifulSoup
+
+from modules.catalog_search import CatalogPipeline
+from utils.records import SupplierRecord
+
+MIB = 1024 * 1024
+
+LLM_OUTPUT = [{"supplier": "Genie", "url": "https://www.genielift.com/", "products": [{"name": "Lift"}]}]
+
+
+class StubChain:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.inputs = []
+
+    async def ainvoke(self, input_data):
+        self.inputs.append(input_data)
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def page(label, paragraphs=50):
+    return "<html><body>" + "".join(f"<p>{label} item {i}</p>" for i in range(paragraphs)) + "</body></html>"
+
+
+@pytest.fixture
+def make_pipeline(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+
+    def make(urls=("a", "b", "c"), pages=None, chain=None, **kwargs):
+        pipeline = CatalogPipeline(memory_bounded=True, **kwargs)
+        pages = pages or {url: page(url) for url in urls}
+
+        async def search_tavily(query, max_results=3):
+            return list(urls)
+
+        async def render(url):
+            await asyncio.sleep(0.01)
+            return pages[url]
+
+        pipeline.search_tavily = search_tavily
+        pipeline._render = render
+        pipeline.chain = chain or StubChain(LLM_OUTPUT)
+        return pipeline
+
+    return make
+
+
+def run(coro, timeout=5):
+    return asyncio.run(asyncio.wait_for(coro, timeout))
+
+
+def test_iter_chunks_caps_page_text(make_pipeline):
+    pipeline = make_pipeline(chunk_chars=50)
+    soup = BeautifulSoup(page("x", paragraphs=100), "html.parser")
+    chunks = list(pipeline._iter_chunks(soup, 300))
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert sum(len(chunk) + 1 for chunk in chunks) <= 300 + len(chunks)
+    assert chunks[0].startswith("x item 0 x item 1")
+
+
+def test_iter_chunks_splits_long_strings(make_pipeline):
+    pipeline = make_pipeline(chunk_chars=40)
+    soup = BeautifulSoup("<p>" + "y" * 130 + "</p>", "html.parser")
+    assert [len(chunk) for chunk in pipeline._iter_chunks(soup, 1000)] == [40, 40, 40, 10]
+
+
+def test_each_page_gets_its_share_of_the_prompt(make_pipeline):
+    chain = StubChain(LLM_OUTPUT)
+    pipeline = make_pipeline(chain=chain, max_prompt_chars=300, chunk_chars=60)
+    records = run(pipeline.run_pipeline("Lifts"))
+
+    prompt = chain.inputs[0]["combined_html"]
+    for label in ("a", "b", "c"):
+        text = " ".join(chunk for chunk in prompt.split("\n\n") if chunk.startswith(f"{label} item"))
+        assert 0 < len(text) <= 100
+    assert isinstance(records[0], SupplierRecord)
+    assert records[0].to_dict() == LLM_OUTPUT[0]
+
+
+@pytest.mark.parametrize("max_memory_mb", [1, 4, 8, 256])
+def test_small_ceilings_do_not_deadlock(make_pipeline, max_memory_mb):
+    pipeline = make_pipeline(max_memory_bytes=max_memory_mb * MIB, page_reserve_bytes=8 * MIB)
+    run(pipeline.run_pipeline("Lifts"))
+    assert pipeline.budget.used == 0
+
+
+def test_pages_larger_than_the_ceiling_do_not_deadlock(make_pipeline):
+    pipeline = make_pipeline(max_memory_bytes=64 * 1024, parse_overhead=1000)
+    run(pipeline.run_pipeline("Lifts"))
+    assert pipeline.budget.used == 0
+
+
+def test_ceiling_applies_backpressure(make_pipeline):
+    pipeline = make_pipeline(max_memory_bytes=MIB, page_reserve_bytes=MIB)
+    active, peak = 0, 0
+
+    async def render(url):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return page(url)
+
+    pipeline._render = render
+    run(pipeline.run_pipeline("Lifts"))
+    assert peak == 1
+
+
+def test_budget_released_after_llm_failure(make_pipeline):
+    pipeline = make_pipeline(chain=StubChain(error=ValueError("bad json")))
+    result = run(pipeline.run_pipeline("Lifts"))
+    assert result == {"category": "Lifts", "error": "bad json"}
+    assert pipeline.budget.used == 0
+
+
+def test_failed_render_releases_its_reservation(make_pipeline):
+    pipeline = make_pipeline()
+
+    async def render(url):
+        raise RuntimeError("timeout")
+
+    pipeline._render = render
+    run(pipeline.run_pipeline("Lifts"))
+    assert pipeline.budget.used == 0
+
+
+def test_non_list_llm_output_is_returned_unchanged(make_pipeline):
+    output = {"supplier": "Genie", "products": []}
+    pipeline = make_pipeline(chain=StubChain(output))
+    assert run(pipeline.run_pipeline("Lifts")) is output
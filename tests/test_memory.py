@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from utils.memory import MemoryBudget
+
+
+def test_rejects_non_positive_ceiling():
+    with pytest.raises(ValueError):
+        MemoryBudget(0)
+
+
+def test_waits_while_ceiling_is_reached():
+    budget = MemoryBudget(100)
+    events = []
+
+    async def worker(i):
+        reservation = await budget.acquire(60)
+        events.append(("in", i))
+        await asyncio.sleep(0.01)
+        events.append(("out", i))
+        await budget.release(reservation)
+
+    async def run():
+        await asyncio.gather(worker(1), worker(2), worker(3))
+
+    asyncio.run(run())
+    assert events == [("in", 1), ("out", 1), ("in", 2), ("out", 2), ("in", 3), ("out", 3)]
+    assert budget.peak == 60
+    assert budget.used == 0
+
+
+def test_requests_fit_together_under_ceiling():
+    budget = MemoryBudget(100)
+
+    async def run():
+        return await asyncio.gather(budget.acquire(40), budget.acquire(40))
+
+    assert [r.nbytes for r in asyncio.run(run())] == [40, 40]
+    assert budget.used == 80
+
+
+def test_oversized_request_runs_alone():
+    budget = MemoryBudget(100)
+
+    async def run():
+        reservation = await budget.acquire(500)
+        assert budget.used == 500
+        waiter = asyncio.ensure_future(budget.acquire(10))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await budget.release(reservation)
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
+    assert budget.used == 10
+
+
+def test_growth_keeps_reserved_bytes_counted():
+    budget = MemoryBudget(100)
+
+    async def run():
+        first = await budget.acquire(30)
+        second = await budget.acquire(30)
+        grow = asyncio.ensure_future(budget.resize(second, 80))
+        await asyncio.sleep(0.01)
+        # The second reservation is not the oldest, so it waits with its 30 bytes still held.
+        assert not grow.done()
+        assert budget.used == 60
+        await budget.release(first)
+        await asyncio.wait_for(grow, 1)
+
+    asyncio.run(run())
+    assert budget.used == 80
+
+
+def test_oldest_reservation_always_grows():
+    budget = MemoryBudget(100)
+
+    async def run():
+        first = await budget.acquire(60)
+        second = await budget.acquire(40)
+        # Both hold their share and want more: the oldest may exceed the ceiling, so neither deadlocks.
+        await asyncio.wait_for(budget.resize(first, 200), 1)
+        await budget.release(first)
+        await asyncio.wait_for(budget.resize(second, 90), 1)
+
+    asyncio.run(run())
+    assert budget.used == 90
+
+
+def test_pinned_reservations_do_not_block_admission():
+    budget = MemoryBudget(100)
+
+    async def run():
+        pinned = await budget.acquire(90)
+        await budget.pin(pinned)
+        # Only pinned bytes are outstanding, so a request over the ceiling is still admitted.
+        reservation = await asyncio.wait_for(budget.acquire(50), 1)
+        assert budget.used == 140
+        await budget.release(reservation)
+        await budget.release(pinned)
+
+    asyncio.run(run())
+    assert budget.used == 0
+
+
+def test_heap_check_is_opt_in(monkeypatch):
+    measured = {"bytes": 95}
+    monkeypatch.setattr("utils.memory.tracemalloc.is_tracing", lambda: True)
+    monkeypatch.setattr("utils.memory.tracemalloc.get_traced_memory", lambda: (measured["bytes"], 0))
+
+    async def run(budget):
+        held = await budget.acquire(10)
+        waiter = asyncio.ensure_future(budget.acquire(10))
+        await asyncio.sleep(0.05)
+        blocked = not waiter.done()
+        measured["bytes"] = 20
+        await asyncio.wait_for(waiter, 1)
+        await budget.release(held)
+        return blocked
+
+    assert asyncio.run(run(MemoryBudget(100, check_heap=True, poll_interval=0.01)))
+    measured["bytes"] = 95
+    assert not asyncio.run(run(MemoryBudget(100, poll_interval=0.01)))
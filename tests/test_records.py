@@ -0,0 +1,120 @@
+import json
+
+from utils.records import (
+    ProductRecord, SupplierRecord, NormalizedCatalog, records_from_suppliers, records_to_suppliers
+)
+
+
+SUPPLIERS = [
+    {
+        "supplier": "Genie",
+        "url": "https://www.genielift.com/",
+        "region": "US",
+        "products": [
+            {
+                "name": "Genie Aerial Lifts",
+                "description": None,
+                "specs": {"height": 60, "dims": {"h": 1, "w": 2.5}},
+                "price": None,
+                "sku": "G-60"
+            },
+            {"price": "$9,000", "name": "Genie Scissor Lift"},
+            "not a product"
+        ]
+    },
+    {"supplier": "Empty Co", "url": "https://empty.example/", "products": []},
+    {"supplier": {"name": "Nested"}, "products": None},
+    "not a supplier",
+    {
+        "supplier": "JLG",
+        "url": "https://www.jlg.com/",
+        "products": [{"name": "JLG Boom", "specs": {"height": 80}, "price": "$15,000"}]
+    },
+    {
+        "supplier": "JLG",
+        "url": "https://www.jlg.com/",
+        "products": [{"name": "JLG Scissor", "specs": "see brochure"}]
+    }
+]
+
+
+def dumps(value):
+    return json.dumps(value)
+
+
+def test_suppliers_round_trip_preserves_order():
+    records = records_from_suppliers(SUPPLIERS)
+    assert len(records) == len(SUPPLIERS)
+    assert dumps(records_to_suppliers(records, limit=len(SUPPLIERS))) == dumps(SUPPLIERS)
+
+
+def test_records_to_suppliers_matches_slice():
+    records = records_from_suppliers(SUPPLIERS)
+    for limit in range(len(SUPPLIERS) + 1):
+        assert dumps(records_to_suppliers(records, limit=limit)) == dumps(SUPPLIERS[:limit])
+
+
+def test_same_named_suppliers_stay_separate():
+    suppliers = records_to_suppliers(records_from_suppliers(SUPPLIERS))
+    jlg = [s for s in suppliers if isinstance(s, dict) and s.get("supplier") == "JLG"]
+    assert [len(s["products"]) for s in jlg] == [1, 1]
+
+
+def test_spec_values_keep_their_types():
+    record = ProductRecord.from_dict(SUPPLIERS[0]["products"][0])
+    product = record.to_dict()
+    assert product["specs"] == {"height": 60, "dims": {"h": 1, "w": 2.5}}
+    assert product["price"] is None
+    assert product["sku"] == "G-60"
+
+
+def test_standard_products_need_no_layout():
+    record = ProductRecord.from_dict(SUPPLIERS[4]["products"][0])
+    assert record.layout is None
+    assert record.to_dict() == SUPPLIERS[4]["products"][0]
+
+
+def test_spec_keys_are_interned():
+    records = records_from_suppliers(SUPPLIERS)
+    genie, jlg = records[0].products[0], records[4].products[0]
+    assert genie.spec_keys[0] is jlg.spec_keys[0]
+    assert isinstance(records[0], SupplierRecord)
+
+
+def test_normalized_catalog_round_trip():
+    result = {
+        "category": "Aerial lifts",
+        "schema": ["name", "price", "weight"],
+        "products": [
+            {"name": "A", "price": 10, "weight": None, "extra": "y"},
+            {"price": 5, "name": "B"},
+            {"name": "C"}
+        ],
+        "notes": "inferred"
+    }
+    catalog = NormalizedCatalog.from_dict(result)
+    assert len(catalog) == 3
+    assert catalog.category == "Aerial lifts"
+    assert dumps(catalog.to_dict()) == dumps(result)
+
+
+def test_normalized_catalog_keeps_non_list_schema():
+    for schema in (None, {"name": "string", "price": "number"}):
+        result = {"category": "c", "schema": schema, "products": [{"name": "a", "price": 1}]}
+        catalog = NormalizedCatalog.from_dict(result)
+        assert dumps(catalog.to_dict()) == dumps(result)
+
+
+def test_normalized_catalog_keeps_missing_sections():
+    result = {"products": "none found", "category": "c"}
+    assert dumps(NormalizedCatalog.from_dict(result).to_dict()) == dumps(result)
+
+
+def test_normalized_rows_share_schema():
+    catalog = NormalizedCatalog.from_dict({
+        "category": "c",
+        "schema": ["name", "size"],
+        "products": [{"name": "a", "size": 3}, {"name": "b", "size": 4}]
+    })
+    assert catalog.rows == [("a", 3), ("b", 4)]
+    assert catalog.row_layout == {}
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from modules.schema_inference import CatalogSchemaDeriver
+from utils.records import records_from_suppliers
+
+
+class StubChain:
+    def __init__(self, result):
+        self.result = result
+        self.inputs = []
+
+    def invoke(self, input_data):
+        self.inputs.append(input_data)
+        return self.result
+
+
+class StubCollection:
+    def __init__(self):
+        self.documents = []
+
+    def insert_one(self, document):
+        self.documents.append(document)
+
+
+@pytest.fixture
+def deriver(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    deriver = CatalogSchemaDeriver()
+    deriver.collection = StubCollection()
+    return deriver
+
+
+SUPPLIERS = [
+    {"supplier": f"S{i}", "url": f"https://s{i}.example/", "products": [{"price": i, "name": f"P{i}"}] if i % 3 else []}
+    for i in range(12)
+]
+
+RESULT = {
+    "category": "Lifts",
+    "schema": {"name": "string", "price": "number"},
+    "products": [{"name": "P1", "price": 1, "color": None}]
+}
+
+
+def test_compact_input_matches_standard_mode(deriver):
+    standard = StubChain(dict(RESULT))
+    compact = StubChain(dict(RESULT))
+
+    deriver.chain = standard
+    deriver.derive_and_store("Lifts", SUPPLIERS)
+    deriver.chain = compact
+    deriver.derive_and_store_compact("Lifts", records_from_suppliers(SUPPLIERS))
+
+    assert compact.inputs == standard.inputs
+    assert json.loads(compact.inputs[0]["products"]) == SUPPLIERS[:10]
+
+
+def test_compact_stores_llm_output_and_returns_compact_form(deriver):
+    result = dict(RESULT)
+    deriver.chain = StubChain(result)
+    catalog = deriver.derive_and_store_compact("Lifts", records_from_suppliers(SUPPLIERS))
+
+    assert deriver.collection.documents == [result]
+    assert deriver.collection.documents[0] is result
+    assert catalog.to_dict() == result
@@ -0,0 +1,143 @@
+import asyncio
+import tracemalloc
+from typing import List, Optional
+
+
+class Reservation:
+    """
+    Bytes held against a `MemoryBudget`. Resized, pinned and released through the budget.
+    """
+
+    __slots__ = ("nbytes", "pinned")
+
+    def __init__(self, nbytes: int):
+        self.nbytes = nbytes
+        self.pinned = False
+
+
+class MemoryBudget:
+    """
+    Per-run memory ceiling enforced through byte reservations.
+    Callers reserve the bytes they are about to hold and wait while the ceiling is reached,
+    which applies backpressure to concurrent page fetches.
+
+    Active reservations belong to work in progress; pinned ones only hold finished results.
+    To guarantee progress, a new reservation is admitted when no active reservation is
+    outstanding, and the oldest active reservation may always grow, even past the ceiling.
+    """
+
+    def __init__(self, max_bytes: int, check_heap: bool = False, poll_interval: float = 0.1):
+        """
+        Args:
+            max_bytes (int): Maximum number of bytes that may be reserved at once.
+            check_heap (bool): Also hold reservations back while the traced Python heap
+                (`tracemalloc`, when tracing) would exceed the ceiling.
+            poll_interval (float): Seconds between re-checks of the heap while waiting.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.max_bytes = max_bytes
+        self.check_heap = check_heap
+        self.poll_interval = poll_interval
+        self.used = 0
+        self.peak = 0
+        self._active: List[Reservation] = []
+        self._cond: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the condition is bound to the running event loop.
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def measured(self) -> int:
+        """
+        Returns the traced Python heap size, or 0 when heap checks are off or `tracemalloc` is not tracing.
+        """
+        if self.check_heap and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def _fits(self, nbytes: int, reservation: Optional[Reservation] = None) -> bool:
+        if self.used + nbytes <= self.max_bytes and self.measured() + nbytes <= self.max_bytes:
+            return True
+        if reservation is None:
+            return not self._active
+        return self._active[0] is reservation
+
+    async def _wait_until_fits(self, cond: asyncio.Condition, nbytes: int, reservation: Optional[Reservation] = None) -> None:
+        while not self._fits(nbytes, reservation):
+            if not self.check_heap:
+                await cond.wait()
+                continue
+            try:
+                # The heap can shrink without a release, so re-check periodically.
+                await asyncio.wait_for(cond.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _add(self, nbytes: int) -> None:
+        self.used += nbytes
+        self.peak = max(self.peak, self.used)
+
+    async def acquire(self, nbytes: int) -> Reservation:
+        """
+        Reserves `nbytes`, waiting until they fit under the ceiling.
+        Args:
+            nbytes (int): Number of bytes to reserve.
+        Returns:
+            Reservation: The active reservation; pass it back to `resize`, `pin` or `release`.
+        """
+        nbytes = max(0, nbytes)
+        cond = self._condition()
+        async with cond:
+            await self._wait_until_fits(cond, nbytes)
+            self._add(nbytes)
+            reservation = Reservation(nbytes)
+            self._active.append(reservation)
+        return reservation
+
+    async def resize(self, reservation: Reservation, nbytes: int) -> None:
+        """
+        Grows or shrinks a reservation in place. Growing waits for the difference to fit
+        while the bytes already reserved stay counted; shrinking never waits.
+        Args:
+            reservation (Reservation): Reservation returned by `acquire`.
+            nbytes (int): New size of the reservation.
+        """
+        nbytes = max(0, nbytes)
+        cond = self._condition()
+        async with cond:
+            diff = nbytes - reservation.nbytes
+            if diff > 0:
+                await self._wait_until_fits(cond, diff, reservation)
+                self._add(diff)
+            else:
+                self.used += diff
+                cond.notify_all()
+            reservation.nbytes = nbytes
+
+    async def pin(self, reservation: Reservation) -> None:
+        """
+        Marks a reservation as holding finished results; it stays counted until released
+        but no longer blocks new reservations from being admitted.
+        """
+        cond = self._condition()
+        async with cond:
+            if not reservation.pinned:
+                reservation.pinned = True
+                self._active.remove(reservation)
+            cond.notify_all()
+
+    async def release(self, reservation: Reservation) -> None:
+        """
+        Returns a reservation's bytes to the budget and wakes up waiting reservations.
+        """
+        cond = self._condition()
+        async with cond:
+            self.used -= reservation.nbytes
+            reservation.nbytes = 0
+            if not reservation.pinned:
+                reservation.pinned = True
+                self._active.remove(reservation)
+            cond.notify_all()
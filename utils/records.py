@@ -0,0 +1,234 @@
+import sys
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
+
+# Marks a field that was absent from the source dictionary, as opposed to present with a null value.
+_MISSING = object()
+# Marks, in a key layout, a key whose value lives in a slot or row tuple.
+_SLOT = object()
+
+PRODUCT_FIELDS = ("name", "description", "specs", "price")
+
+
+def _intern(key: Any) -> Any:
+    return sys.intern(key) if type(key) is str else key
+
+
+def _layout(source: Dict[str, Any], slotted: Iterable[str]) -> Dict[str, Any]:
+    """
+    Copies `source` in key order, replacing the values of `slotted` keys with a placeholder.
+    """
+    slotted = set(slotted)
+    return {k: (_SLOT if k in slotted else v) for k, v in source.items()}
+
+
+class ProductRecord:
+    """
+    Compact, slotted representation of a single scraped product.
+    Spec keys are interned so repeated attribute names share one string object; all values
+    are kept exactly as the LLM returned them. Products with keys beyond the standard fields,
+    or in a different order, also keep a key layout so `to_dict` reproduces them exactly.
+    """
+
+    __slots__ = ("name", "description", "price", "spec_keys", "spec_values", "layout")
+
+    def __init__(
+        self,
+        name: Any = _MISSING,
+        description: Any = _MISSING,
+        price: Any = _MISSING,
+        spec_keys: Optional[Tuple[str, ...]] = None,
+        spec_values: Tuple[Any, ...] = (),
+        layout: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.description = description
+        self.price = price
+        self.spec_keys = spec_keys
+        self.spec_values = spec_values
+        self.layout = layout
+
+    @classmethod
+    def from_dict(cls, product: Dict[str, Any]) -> "ProductRecord":
+        """
+        Builds a record from one entry of a supplier's `products` list.
+        Args:
+            product (Dict[str, Any]): Raw product dictionary from the LLM.
+        Returns:
+            ProductRecord: The compact record.
+        """
+        specs = product.get("specs")
+        spec_keys, spec_values = None, ()
+        if isinstance(specs, dict):
+            spec_keys = tuple(_intern(k) for k in specs)
+            spec_values = tuple(specs.values())
+        slotted = [
+            f for f in PRODUCT_FIELDS
+            if f in product and (f != "specs" or spec_keys is not None)
+        ]
+        layout = None
+        if list(product) != slotted:
+            layout = _layout(product, slotted)
+        return cls(
+            name=product.get("name", _MISSING),
+            description=product.get("description", _MISSING),
+            price=product.get("price", _MISSING),
+            spec_keys=spec_keys,
+            spec_values=spec_values,
+            layout=layout
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the product dictionary this record was built from, in its original key order.
+        """
+        values = {
+            "name": self.name,
+            "description": self.description,
+            "specs": _MISSING if self.spec_keys is None else dict(zip(self.spec_keys, self.spec_values)),
+            "price": self.price
+        }
+        if self.layout is not None:
+            return {k: (values[k] if v is _SLOT else v) for k, v in self.layout.items()}
+        return {f: values[f] for f in PRODUCT_FIELDS if values[f] is not _MISSING}
+
+
+class SupplierRecord:
+    """
+    One supplier entry of the LLM output, with its products stored as `ProductRecord`s.
+    """
+
+    __slots__ = ("fields", "products")
+
+    def __init__(self, fields: Dict[str, Any], products: Optional[List[Any]]):
+        self.fields = fields
+        self.products = products
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "SupplierRecord":
+        """
+        Builds a record from a supplier dictionary; non-dict products are kept as they are.
+        """
+        products = entry.get("products")
+        if not isinstance(products, list):
+            return cls(dict(entry), None)
+        return cls(
+            _layout(entry, ["products"]),
+            [ProductRecord.from_dict(p) if isinstance(p, dict) else p for p in products]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the supplier dictionary this record was built from, in its original key order.
+        """
+        if self.products is None:
+            return dict(self.fields)
+        products = [p.to_dict() if isinstance(p, ProductRecord) else p for p in self.products]
+        return {k: (products if v is _SLOT else v) for k, v in self.fields.items()}
+
+
+def records_from_suppliers(suppliers: Iterable[Any]) -> List[Any]:
+    """
+    Converts the LLM's supplier → products output into compact records.
+    Entries keep their positions; anything that is not a supplier dictionary is kept as it is.
+    Args:
+        suppliers (Iterable[Any]): Supplier dictionaries with a `products` list.
+    Returns:
+        List[Any]: One `SupplierRecord` (or raw entry) per supplier entry.
+    """
+    return [SupplierRecord.from_dict(e) if isinstance(e, dict) else e for e in suppliers]
+
+
+def records_to_suppliers(records: Sequence[Any], limit: int = 10) -> List[Any]:
+    """
+    Rebuilds the first `limit` supplier entries, matching a `[:limit]` slice of the original list.
+    Args:
+        records (Sequence[Any]): Records returned by `records_from_suppliers`.
+        limit (int): Maximum number of supplier entries to materialize.
+    Returns:
+        List[Any]: Supplier dictionaries with nested `products`.
+    """
+    return [r.to_dict() if isinstance(r, SupplierRecord) else r for r in records[:limit]]
+
+
+class NormalizedCatalog:
+    """
+    Schema-normalized products for one category.
+    The schema's columns are shared by every row, and each row is a tuple of raw values aligned
+    to them. Rows whose keys differ from the schema keep a key layout in `row_layout`, and the
+    top-level keys (including `category`) are kept in `layout`, so `to_dict` reproduces the
+    original document. A `schema` or `products` value that is not a list is kept verbatim.
+    """
+
+    __slots__ = ("schema", "columns", "rows", "row_layout", "layout")
+
+    def __init__(
+        self,
+        schema: Optional[Tuple[str, ...]],
+        rows: Optional[List[Optional[Tuple[Any, ...]]]],
+        row_layout: Dict[int, Any],
+        layout: Dict[str, Any]
+    ):
+        self.schema = schema
+        self.columns = tuple(dict.fromkeys(schema or ()))
+        self.rows = rows
+        self.row_layout = row_layout
+        self.layout = layout
+
+    @property
+    def category(self) -> Any:
+        return self.layout.get("category")
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> "NormalizedCatalog":
+        """
+        Builds a compact catalog from the schema inference output.
+        Args:
+            result (Dict[str, Any]): Dictionary with `category`, `schema` and `products`.
+        Returns:
+            NormalizedCatalog: The compact catalog.
+        """
+        raw_schema = result.get("schema")
+        schema = None
+        if isinstance(raw_schema, list) and all(type(k) is str for k in raw_schema):
+            schema = tuple(_intern(k) for k in raw_schema)
+        columns = tuple(dict.fromkeys(schema or ()))
+
+        raw_products = result.get("products")
+        rows, row_layout = None, {}
+        if isinstance(raw_products, list):
+            rows = []
+            for i, product in enumerate(raw_products):
+                if not isinstance(product, dict):
+                    rows.append(None)
+                    row_layout[i] = product
+                    continue
+                rows.append(tuple(product.get(k, _MISSING) for k in columns))
+                if list(product) != [k for k in columns if k in product]:
+                    row_layout[i] = _layout(product, columns)
+
+        slotted = [k for k, kept in (("schema", schema), ("products", rows)) if kept is not None]
+        return cls(schema, rows, row_layout, _layout(result, slotted))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the catalog in the document shape stored in MongoDB.
+        """
+        products = None
+        if self.rows is not None:
+            index = {k: i for i, k in enumerate(self.columns)}
+            products = []
+            for i, row in enumerate(self.rows):
+                if row is None:
+                    products.append(self.row_layout[i])
+                elif i in self.row_layout:
+                    products.append({
+                        k: (row[index[k]] if v is _SLOT else v)
+                        for k, v in self.row_layout[i].items()
+                    })
+                else:
+                    products.append({k: v for k, v in zip(self.columns, row) if v is not _MISSING})
+        values = {"schema": list(self.schema or ()), "products": products}
+        return {k: (values[k] if v is _SLOT else v) for k, v in self.layout.items()}
+
+    def __len__(self) -> int:
+        return len(self.rows or ())